@@ -2,20 +2,25 @@
 # Observe -> Think -> Act -> Verify loop
 
 import asyncio
-import hashlib
-import json
 import logging
 import os
 import re
+import traceback
+from collections import deque
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
 
-from openai import AsyncOpenAI
+import orjson
 from dotenv import load_dotenv
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from playwright._impl._errors import TimeoutError as PlaywrightTimeoutError
 
+if TYPE_CHECKING:
+    # openai (and httpx under it) is most of this module's import time;
+    # it's loaded on first client use instead
+    from openai import AsyncOpenAI
+
 # Import modules
 from security import SecurityEngine
 from browser_sense import BrowserIntelliSense
@@ -28,17 +33,91 @@ logger = logging.getLogger(__name__)
 
 OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434/v1")
 OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "qwen2.5-coder:7b")
+# Deadline for the startup warmup, which may include loading the model (seconds)
+WARMUP_TIMEOUT = 120.0
+# Client-side deadline for one THINK call (seconds)
+LLM_TIMEOUT = float(os.environ.get("OLLAMA_TIMEOUT", "15"))
 
+# Shared LLM client (keeps connections to Ollama warm across calls and agents)
+_shared_client: Optional["AsyncOpenAI"] = None
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
 
-# System prompt for the LLM
-SYSTEM_PROMPT = """You are a precise browser automation agent.
 
-GOAL: {goal}
-CURRENT URL: {url}
-HISTORY: {history}
+def get_shared_client() -> "AsyncOpenAI":
+    """
+    Return the shared AsyncOpenAI client for the running event loop.
+    
+    Pooled connections are bound to the loop that opened them, so a
+    new loop (e.g. a second `asyncio.run`) gets a fresh client.
+    """
+    global _shared_client, _shared_client_loop
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client_loop is not loop:
+        import httpx
+        from openai import AsyncOpenAI
+        
+        timeout = httpx.Timeout(LLM_TIMEOUT, connect=2.0)
+        http_client = httpx.AsyncClient(
+            # One warm connection per concurrent agent (see run_many)
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=60.0),
+            timeout=timeout
+        )
+        # No silent retries: a stalled model would otherwise cost 3x the timeout
+        _shared_client = AsyncOpenAI(
+            base_url=OLLAMA_BASE_URL,
+            api_key="ollama",
+            timeout=timeout,
+            max_retries=0,
+            http_client=http_client
+        )
+        _shared_client_loop = loop
+    return _shared_client
 
-PAGE ELEMENTS:
-{dom_tree}
+
+# Log separators for the run loop
+_BANNER = "=" * 60
+_RULE = "─" * 40
+
+# JSON extraction patterns (compiled once, used on every LLM response)
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_FENCE_EDGES_RE = re.compile(r'\A```(?:json)?\s*|\s*```\Z')
+
+
+def _json_object_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Return the `(start, end)` of every balanced `{...}` in `text`,
+    outer objects before the ones nested inside them.
+    
+    One pass with a stack of open-brace positions, tracking string
+    literals (with escapes) so braces inside values don't count. A
+    stray `{` that never closes just stays on the stack, so objects
+    after it are still found and nothing is rescanned.
+    """
+    spans = []
+    opens = []
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            if opens:
+                in_string = True
+        elif ch == '{':
+            opens.append(i)
+        elif ch == '}' and opens:
+            spans.append((opens.pop(), i + 1))
+    spans.sort()
+    return spans
+
+
+# System prompt for the LLM (static, so Ollama can reuse its prefix cache)
+SYSTEM_PROMPT = """You are a precise browser automation agent.
 
 RULES:
 1. You must output VALID JSON only. No conversation, no explanation.
@@ -50,12 +129,12 @@ RULES:
 7. If the URL doesn't change after an action, try a different action (like 'press_enter' or clicking a button).
 
 RESPONSE FORMAT (JSON ONLY):
-{{
+{
   "thought": "Brief reasoning of what to do next",
   "action": "click" | "type" | "press_enter" | "scroll_down" | "scroll_up" | "wait" | "done",
   "target_id": 12,
   "value": "search query"
-}}
+}
 
 ACTION TYPES:
 - click: Click element by target_id
@@ -68,8 +147,187 @@ ACTION TYPES:
 
 CRITICAL: Output ONLY the JSON object. No other text."""
 
+_SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
 
-@dataclass
+# Per-step page state, sent as the user message
+STATE_PROMPT = """GOAL: {goal}
+CURRENT URL: {url}
+HISTORY: {history}
+
+PAGE ELEMENTS:
+{dom_tree}
+
+Complete this goal: {goal}"""
+
+
+class BrowserPool:
+    """
+    Process-wide Chromium pool.
+    
+    Launches one browser per headless mode and hands out fresh
+    contexts, so repeated runs skip the cold Chromium start. The pool
+    counts its users (open contexts and `hold()` blocks) and shuts
+    itself down when the last one is released, so a plain
+    `agent.run()` leaves nothing running.
+    """
+    
+    _playwright = None
+    _browsers: Dict[bool, Browser] = {}
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock: Optional[asyncio.Lock] = None
+    _users = 0
+    
+    @classmethod
+    def _bind_loop(cls) -> None:
+        """Reset the pool if it was created on another event loop."""
+        loop = asyncio.get_running_loop()
+        if cls._loop is loop:
+            return
+        
+        # Playwright objects are bound to the loop that created them; if
+        # that loop is still alive, close them there
+        stale_loop, browsers, playwright = cls._loop, list(cls._browsers.values()), cls._playwright
+        if stale_loop is not None and (browsers or playwright):
+            if stale_loop.is_running():
+                asyncio.run_coroutine_threadsafe(
+                    cls._close(browsers, playwright), stale_loop
+                )
+            else:
+                logger.warning("Browser pool from a closed event loop was never shut down")
+        
+        cls._playwright = None
+        cls._browsers = {}
+        cls._loop = loop
+        cls._lock = asyncio.Lock()
+        cls._users = 0
+    
+    @classmethod
+    async def get_context(cls, headless: bool) -> BrowserContext:
+        """Get a fresh context on a (possibly already running) browser."""
+        cls._bind_loop()
+        cls._users += 1
+        try:
+            # Concurrent agents must not each launch their own browser
+            async with cls._lock:
+                browser = cls._browsers.get(headless)
+                if browser is None or not browser.is_connected():
+                    if cls._playwright is None:
+                        cls._playwright = await async_playwright().start()
+                    logger.info("Launching Chromium (headless=%s)", headless)
+                    browser = await cls._playwright.chromium.launch(headless=headless)
+                    cls._browsers[headless] = browser
+                
+                return await browser.new_context()
+        except BaseException:
+            await cls._unuse()
+            raise
+    
+    @classmethod
+    async def release(cls, context: BrowserContext) -> None:
+        """Close a context; the browser stays up while the pool has users."""
+        try:
+            await context.close()
+        finally:
+            await cls._unuse()
+    
+    @classmethod
+    @asynccontextmanager
+    async def hold(cls):
+        """
+        Keep the browser warm for the duration of the block.
+        
+        Use around back-to-back runs, so each one doesn't relaunch
+        Chromium after the previous one released the last context.
+        """
+        cls._bind_loop()
+        cls._users += 1
+        try:
+            yield cls
+        finally:
+            await cls._unuse()
+    
+    @classmethod
+    async def _unuse(cls) -> None:
+        """Drop one user; shut the pool down once nobody uses it."""
+        cls._users = max(cls._users - 1, 0)
+        if cls._users == 0 and cls._lock is not None:
+            async with cls._lock:
+                # Someone may have taken a context while we waited
+                if cls._users == 0:
+                    await cls._shutdown_locked()
+    
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close all pooled browsers and stop Playwright now."""
+        if cls._lock is None or cls._loop is not asyncio.get_running_loop():
+            cls._bind_loop()
+        async with cls._lock:
+            await cls._shutdown_locked()
+    
+    @classmethod
+    async def _shutdown_locked(cls) -> None:
+        browsers, playwright = list(cls._browsers.values()), cls._playwright
+        cls._browsers = {}
+        cls._playwright = None
+        await cls._close(browsers, playwright)
+    
+    @staticmethod
+    async def _close(browsers: List[Browser], playwright) -> None:
+        try:
+            for browser in browsers:
+                await browser.close()
+            if playwright:
+                await playwright.stop()
+        except Exception as e:
+            logger.warning("Pool shutdown warning: %s", e)
+
+
+class JSONStreamScanner:
+    """
+    Incremental brace-depth scanner for streamed LLM output.
+    
+    Tracks string literals and escapes so braces inside values
+    don't count. `feed` returns True once the first top-level
+    JSON object has closed.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+    
+    def feed(self, text: str) -> bool:
+        # Most deltas are plain words; skip the per-char walk when
+        # nothing in them can change the scanner state.
+        if self.in_string:
+            if not self.escaped and '"' not in text and '\\' not in text:
+                return False
+        elif '{' not in text and '}' not in text and '"' not in text:
+            return False
+        
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                if self.started:
+                    self.in_string = True
+            elif ch == '{':
+                self.depth += 1
+                self.started = True
+            elif ch == '}' and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+@dataclass(slots=True, frozen=True)
 class StepRecord:
     step: int
     action: str
@@ -89,6 +347,15 @@ class StepRecord:
 
 class OllamaAgent:
     
+    # Prompt budget for the PAGE ELEMENTS list
+    MAX_ELEMENT_CHARS = 4000
+    # Iron Gate: actions scoring at or above this are refused
+    BLOCK_RISK = 90
+    # Actions that never navigate, so verify needn't wait for a load
+    STATIC_ACTIONS = frozenset({'scroll_down', 'scroll_up', 'wait'})
+    # Cap on verify's load wait, so a stalled page can't hang the step
+    LOAD_WAIT_MS = 2000
+    
     def __init__(
         self,
         model: str = OLLAMA_MODEL,
@@ -102,47 +369,83 @@ class OllamaAgent:
         self.max_iterations = max_iterations
         self.debug_mode = debug_mode
         
-        self.history: List[StepRecord] = []  # action history for avoiding loops
-        
-        self.client = AsyncOpenAI(base_url=OLLAMA_BASE_URL, api_key="ollama")
+        self.history: Deque[StepRecord] = deque(maxlen=5)  # last 5 actions, for avoiding loops
+        # Rendered history lines (each record formatted once) and their join
+        self._history_lines: Deque[str] = deque(maxlen=5)
+        self._history_text = "No previous actions."
         
         self.security = SecurityEngine(enabled=enable_security)
-        self.som = BrowserIntelliSense(debug_mode=debug_mode)
+        # Nobody sees the SoM badges in a headless, non-debug run
+        self.som = BrowserIntelliSense(
+            debug_mode=debug_mode,
+            draw_overlays=not headless or debug_mode
+        )
         self.distiller = DOMDistiller()
         
-        # Browser state
-        self._playwright = None
+        # Browser state (browser itself is owned by BrowserPool)
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
+        self._warmup_task: Optional[asyncio.Task] = None
         
         # Step counter
         self._step = 0
         
-        logger.info(f"OllamaAgent initialized (model={model}, debug={debug_mode})")
+        logger.info("OllamaAgent initialized (model=%s, debug=%s)", model, debug_mode)
+    
+    @property
+    def client(self) -> "AsyncOpenAI":
+        """LLM client shared by all agents on the current event loop."""
+        return get_shared_client()
     
     # BROWSER LIFECYCLE
     
     async def start(self) -> None:
-        """Start the browser."""
+        """Start a browser session (context + page) from the pool."""
         logger.info("Starting browser...")
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=self.headless)
-        self._context = await self._browser.new_context()
-        self._page = await self._context.new_page()
+        # Prime the LLM while Chromium starts
+        self._warmup_task = asyncio.create_task(self._warmup())
+        try:
+            self._context = await BrowserPool.get_context(self.headless)
+            self._browser = self._context.browser
+            await self.som.install(self._context)
+            self._page = await self._context.new_page()
+        except Exception:
+            # Cancel the warmup and give the context back to the pool
+            await self.stop()
+            raise
         logger.info("Browser started")
     
     async def stop(self) -> None:
-        """Stop the browser."""
+        """Stop the browser session (the pool closes Chromium once unused)."""
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
         try:
-            if self._browser:
-                await self._browser.close()
-            if self._playwright:
-                await self._playwright.stop()
+            if self._context:
+                await BrowserPool.release(self._context)
         except Exception as e:
-            logger.warning(f"Stop warning: {e}")
+            logger.warning("Stop warning: %s", e)
+        self._context = None
+        self._page = None
         logger.info("Browser stopped")
     
+    async def _warmup(self) -> None:
+        """
+        Send the static system prompt once so Ollama loads the model and
+        caches the prompt prefix before the first real THINK.
+        """
+        try:
+            # Own deadline: this call may have to load the model first
+            client = self.client.with_options(timeout=WARMUP_TIMEOUT)
+            await client.chat.completions.create(
+                model=self.model,
+                messages=[_SYSTEM_MSG, {"role": "user", "content": "ok"}],
+                max_tokens=1
+            )
+            logger.debug("LLM warmup complete")
+        except Exception as e:
+            logger.debug("LLM warmup failed: %s", e)
+    
     # JSON EXTRACTION (Robust)
     
     def extract_json_from_text(self, response_text: str) -> Tuple[Optional[Dict], str]:
@@ -162,60 +465,54 @@ class OllamaAgent:
         
         text = response_text.strip()
         
-        # Strategy 1: Direct parse
-        try:
-            return json.loads(text), ""
-        except json.JSONDecodeError:
-            pass
+        # Strip a wrapping code fence. The closing fence may be missing
+        # because streaming stops at the end of the object.
+        if text.startswith("```"):
+            text = _FENCE_EDGES_RE.sub("", text)
+        
+        # No object at all (refusal, prose): nothing below can succeed
+        if '{' not in text:
+            logger.warning("No JSON object in response: %.100s", text)
+            return None, "FORMAT_ERROR: No JSON object in response"
+        
+        # Strategy 1: Direct parse (only worth trying on a bare object)
+        if text.startswith('{') and text.endswith('}'):
+            try:
+                return orjson.loads(text), ""
+            except orjson.JSONDecodeError:
+                pass
         
         # Strategy 2: Extract from markdown
         if "```" in text:
-            match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
+            match = _JSON_FENCE_RE.search(text)
             if match:
                 try:
-                    return json.loads(match.group(1)), ""
-                except json.JSONDecodeError:
+                    return orjson.loads(match.group(1)), ""
+                except orjson.JSONDecodeError:
                     pass
         
-        # try regex for nested json
-        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        for match in matches:
+        # Strategy 3: Each balanced object in the text; if one doesn't
+        # parse, look at the objects nested inside it
+        parsed_end = 0
+        for start, end in _json_object_spans(text):
+            if start < parsed_end:
+                continue  # nested in an object that already parsed
             try:
-                parsed = json.loads(match)
-                if 'action' in parsed:
-                    return parsed, ""
-            except json.JSONDecodeError:
+                parsed = orjson.loads(text[start:end])
+            except orjson.JSONDecodeError:
                 continue
+            if 'action' in parsed:
+                return parsed, ""
+            parsed_end = end
         
-        # Strategy 4: First { to last }
-        first = text.find('{')
-        last = text.rfind('}')
-        
-        if first != -1 and last > first:
-            try:
-                parsed = json.loads(text[first:last + 1])
-                if 'action' in parsed:
-                    return parsed, ""
-            except json.JSONDecodeError:
-                pass
-        
-        logger.warning(f"Failed to extract JSON: {text[:100]}")
+        logger.warning("Failed to extract JSON: %.100s", text)
         return None, "FORMAT_ERROR: Could not parse JSON"
     
     # STATE MEMORY
     
     def _format_history(self) -> str:
         """Format history for the system prompt."""
-        if not self.history:
-            return "No previous actions."
-        
-        lines = []
-        for record in self.history[-5:]:  # Last 5
-            lines.append(str(record))
-        
-        return "\n".join(lines)
+        return self._history_text
     
     def _add_to_history(self, action: str, target: str, result: str) -> None:
         self._step += 1
@@ -225,11 +522,10 @@ class OllamaAgent:
             target=target,
             result=result
         )
-        self.history.append(record)
-        
-        # Keep last 5
-        if len(self.history) > 5:
-            self.history = self.history[-5:]
+        self.history.append(record)  # deque drops the oldest past 5
+        # Format the new record once; re-join only when history changes
+        self._history_lines.append(str(record))
+        self._history_text = "\n".join(self._history_lines)
     
     # OBSERVE PHASE
     
@@ -246,15 +542,17 @@ class OllamaAgent:
             # Inject SoM
             num_elements, error = await self.som.inject_script(self._page)
             if error:
-                logger.warning(f"SoM error: {error}")
+                logger.warning("SoM error: %s", error)
             
             # Get observation
-            element_map, elements_text, error = await self.som.get_observation(self._page)
+            element_map, elements_text, error = await self.som.get_observation(
+                self._page, max_chars=self.MAX_ELEMENT_CHARS
+            )
             
             if error:
                 return "", {}, error
             
-            logger.info(f"   Found {len(element_map)} elements")
+            logger.info("   Found %d elements", len(element_map))
             return elements_text, element_map, ""
             
         except Exception as e:
@@ -266,11 +564,18 @@ class OllamaAgent:
         self,
         goal: str,
         elements_text: str,
-        last_error: Optional[str] = None
+        last_error: Optional[str] = None,
+        current_url: Optional[str] = None
     ) -> Tuple[Optional[Dict], str]:
         """
         Query LLM for next action.
         
+        Args:
+            goal: The user's goal
+            elements_text: Tagged element list for the prompt
+            last_error: Error from the previous step, if any
+            current_url: Page URL already read this iteration
+            
         Returns:
             Tuple of (action_dict, error)
         """
@@ -282,39 +587,81 @@ class OllamaAgent:
             history_context += f"\n⚠️ LAST ERROR: {last_error}"
         
         # Build prompt
-        prompt = SYSTEM_PROMPT.format(
+        prompt = STATE_PROMPT.format(
             goal=goal,
-            url=self._page.url,
+            url=current_url or self._page.url,
             history=history_context,
-            dom_tree=elements_text[:4000] or "No elements found"
+            dom_tree=elements_text or "No elements found"
         )
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": f"Complete this goal: {goal}"}
-                ],
-                temperature=0.1,
-                max_tokens=500
+            # One deadline over the request and the whole stream
+            response_text = await asyncio.wait_for(
+                self._request_action(prompt), LLM_TIMEOUT
             )
-            
-            response_text = response.choices[0].message.content.strip()
-            logger.debug(f"LLM response: {response_text[:150]}")
+            logger.debug("LLM response: %.150s", response_text)
             
             # Extract JSON
             action_dict, error = self.extract_json_from_text(response_text)
             
             if action_dict:
-                thought = action_dict.get('thought', '')[:60]
-                logger.info(f"   Thought: {thought}")
+                logger.info("   Thought: %.60s", action_dict.get('thought', ''))
             
             return action_dict, error
             
+        except asyncio.TimeoutError:
+            logger.warning("LLM timed out after %.0fs, waiting instead", LLM_TIMEOUT)
+            return {"action": "wait", "thought": "LLM timeout"}, ""
         except Exception as e:
             return None, f"LLM_ERROR: {str(e)[:100]}"
     
+    async def _request_action(self, prompt: str) -> str:
+        """
+        Send one THINK request and read the streamed reply.
+        
+        Returns:
+            The response text, up to the end of the first JSON object
+        """
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[_SYSTEM_MSG, {"role": "user", "content": prompt}],
+            temperature=0.1,
+            max_tokens=200,
+            # Constrained decoding: Ollama only emits a JSON object
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        
+        return (await self._collect_stream(stream)).strip()
+    
+    async def _collect_stream(self, stream) -> str:
+        """
+        Accumulate streamed tokens until the first JSON object is complete.
+        
+        Stops reading (and closes the stream) as soon as the braces
+        balance, so the model doesn't spend time decoding trailing prose.
+        
+        Returns:
+            The accumulated response text
+        """
+        scanner = JSONStreamScanner()
+        parts = []
+        
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                
+                delta = chunk.choices[0].delta.content or ""
+                parts.append(delta)
+                
+                if scanner.feed(delta):
+                    break
+        finally:
+            await stream.close()
+        
+        return "".join(parts)
+    
     # ACT PHASE
     
     async def act(
@@ -334,7 +681,7 @@ class OllamaAgent:
         target_id = action_dict.get('target_id')
         value = action_dict.get('value', '')
         
-        logger.info(f"   Action: {action_type}, Target: {target_id}, Value: {value[:20] if value else ''}")
+        logger.info("   Action: %s, Target: %s, Value: %.20s", action_type, target_id, value or '')
         
         # Security check for navigation
         if action_type == 'navigate':
@@ -342,7 +689,7 @@ class OllamaAgent:
             risk, reason = self.security.calculate_risk(
                 {'action': 'navigate', 'value': url}, url
             )
-            if risk >= 90:
+            if risk >= self.BLOCK_RISK:
                 return False, f"BLOCKED: {reason}"
         
         # Check for repeated type actions (stubborn model fix)
@@ -352,7 +699,7 @@ class OllamaAgent:
                 last_step.action == 'type' and 
                 last_step.target == f"#{target_id}"): # target is formatted as '#ID'
                 
-                logger.warning(f"Repeated type action on #{target_id}. Forcing press_enter.")
+                logger.warning("Repeated type action on #%s. Forcing press_enter.", target_id)
                 action_type = 'press_enter'
                 # Keep the target_id
                 action_dict['action'] = 'press_enter' # Update action_dict for execute_action
@@ -373,27 +720,42 @@ class OllamaAgent:
     async def verify(
         self,
         before_url: str,
-        before_hash: str
+        before_hash: str,
+        after_hash: Optional[str] = None,
+        action_type: Optional[str] = None
     ) -> Tuple[bool, str]:
         """
         Verify if the action had an effect.
         
+        Args:
+            before_url: URL before the action
+            before_hash: Page hash before the action
+            after_hash: Page hash after the action, if already taken
+            action_type: The action performed, used to skip needless waits
+            
         Returns:
             Tuple of (page_changed, verification_message)
         """
         logger.info("🔍 VERIFY")
         
-        # Wait for page to settle
-        await self._page.wait_for_load_state('domcontentloaded')
+        if after_hash is None:
+            if action_type not in self.STATIC_ACTIONS:
+                # Wait for page to settle
+                try:
+                    await self._page.wait_for_load_state(
+                        'domcontentloaded', timeout=self.LOAD_WAIT_MS
+                    )
+                except PlaywrightTimeoutError:
+                    logger.debug("Load wait timed out, hashing current DOM")
+            after_hash = await self.som.get_page_hash(self._page)
         
         after_url = self._page.url
-        after_hash = await self.som.get_page_hash(self._page)
         
         url_changed = after_url != before_url
         content_changed = after_hash != before_hash
         
         if url_changed:
-            logger.info(f"   ✓ URL changed: {before_url} → {after_url}")
+            logger.info("   ✓ URL changed: %s → %s", before_url, after_url)
             return True, f"URL changed to {after_url}"
         elif content_changed:
             logger.info("   ✓ Page content changed")
@@ -404,6 +766,40 @@ class OllamaAgent:
     
     # MAIN LOOP: Observe → Think → Act → Verify
     
+    @classmethod
+    async def run_many(
+        cls,
+        goals: List[str],
+        start_url: str = "https://www.google.com",
+        max_parallel: int = 4,
+        **agent_kwargs
+    ) -> List[bool]:
+        """
+        Run several goals concurrently, one agent (and context) per goal.
+        
+        All agents share the pooled browser and the LLM client. Ollama
+        only decodes OLLAMA_NUM_PARALLEL requests at once, so keep
+        `max_parallel` at or below that.
+        
+        Args:
+            goals: Natural language goals
+            start_url: Starting URL for every goal
+            max_parallel: Maximum goals running at the same time
+            **agent_kwargs: Passed to each agent's constructor
+            
+        Returns:
+            Per-goal success flags, in the order of `goals`
+        """
+        gate = asyncio.Semaphore(max_parallel)
+        
+        async def run_one(goal: str) -> bool:
+            async with gate:
+                return await cls(**agent_kwargs).run(goal, start_url)
+        
+        # Keep Chromium up between goals that start after others finish
+        async with BrowserPool.hold():
+            return list(await asyncio.gather(*(run_one(goal) for goal in goals)))
+    
     async def run(self, goal: str, start_url: str = "https://www.google.com") -> bool:
         """
         Run the agent to achieve the goal.
@@ -415,43 +811,55 @@ class OllamaAgent:
         Returns:
             True if goal achieved
         """
-        logger.info(f"{'='*60}")
-        logger.info(f"STARTING AGENT")
-        logger.info(f"Goal: {goal}")
-        logger.info(f"{'='*60}")
+        logger.info(_BANNER)
+        logger.info("STARTING AGENT")
+        logger.info("Goal: %s", goal)
+        logger.info(_BANNER)
         
         await self.start()
         
         try:
             # Navigate to start
-            logger.info(f"Navigating to {start_url}")
+            logger.info("Navigating to %s", start_url)
             await self._page.goto(start_url, wait_until="domcontentloaded")
-            try:
-                await self._page.wait_for_load_state('networkidle', timeout=5000)
-            except Exception:
-                logger.warning("Initial navigation wait timed out (proceeding anyway)")
+            # Same settle logic as the 'wait' action (network quiet, then DOM quiet)
+            await self.som.execute_action(self._page, {'action': 'wait'}, {})
             
             last_error: Optional[str] = None
+            last_hash = ""
+            # Observation already taken by the previous step's verify
+            prefetched = None
             
             for iteration in range(self.max_iterations):
-                logger.info(f"\n{'─'*40}")
-                logger.info(f"ITERATION {iteration + 1}/{self.max_iterations}")
-                logger.info(f"{'─'*40}")
+                logger.info("\n%s", _RULE)
+                logger.info("ITERATION %d/%d", iteration + 1, self.max_iterations)
+                logger.info(_RULE)
                 
-                # Capture state before
+                # Capture state before (SoM tagging hashes the page
+                # before it draws anything)
                 before_url = self._page.url
-                before_hash = await self.som.get_page_hash(self._page)
-                
-                elements_text, element_map, obs_error = await self.observe()
+                if prefetched:
+                    before_hash, (elements_text, element_map, obs_error) = prefetched
+                    prefetched = None
+                else:
+                    elements_text, element_map, obs_error = await self.observe()
+                    before_hash = self.som.last_page_hash
                 
                 if obs_error:
                     last_error = obs_error
                     continue
                 
+                # Same page as last step and the last step failed: tell the
+                # model so it doesn't just re-propose the same action
+                if last_error and before_hash and before_hash == last_hash:
+                    last_error += " (page unchanged - pick a different element or action)"
+                last_hash = before_hash
+                
                 action_dict, think_error = await self.think(
                     goal=goal,
                     elements_text=elements_text,
-                    last_error=last_error
+                    last_error=last_error,
+                    current_url=before_url
                 )
                 
                 if think_error:
@@ -461,6 +869,7 @@ class OllamaAgent:
                 
                 action_type = action_dict.get('action', 'unknown')
                 target_id = action_dict.get('target_id', '')
+                target_str = f"#{target_id}" if target_id else ""
                 
                 # Check for done
                 if action_type == 'done':
@@ -470,15 +879,26 @@ class OllamaAgent:
                 
                 success, result = await self.act(action_dict, element_map)
                 
-                target_str = f"#{target_id}" if target_id else ""
-                
                 if not success:
                     self._add_to_history(action_type, target_str, f"FAILED: {result}")
                     last_error = result
-                    logger.warning(f"   ✗ {result}")
+                    logger.warning("   ✗ %s", result)
                     continue
                 
-                page_changed, verify_msg = await self.verify(before_url, before_hash)
+                # Observe the settled page for the next step; tagging waits
+                # for the DOM, drops old badges and hashes it for verify
+                if iteration + 1 < self.max_iterations:
+                    observation = await self.observe()
+                    after_hash = self.som.last_page_hash
+                    prefetched = (after_hash, observation)
+                else:
+                    # Last step: clear badges so they don't skew the hash
+                    await self.som.cleanup(self._page)
+                    after_hash = None
+                
+                page_changed, verify_msg = await self.verify(
+                    before_url, before_hash, after_hash, action_type
+                )
                 
                 if page_changed:
                     self._add_to_history(action_type, target_str, verify_msg)
@@ -486,16 +906,12 @@ class OllamaAgent:
                 else:
                     self._add_to_history(action_type, target_str, "NO_EFFECT")
                     last_error = "Action had no visible effect"
-                
-                # Cleanup overlays
-                await self.som.cleanup(self._page)
             
-            logger.warning(f"\n⚠ Max iterations ({self.max_iterations}) reached")
+            logger.warning("\n⚠ Max iterations (%d) reached", self.max_iterations)
             return False
             
         except Exception as e:
-            logger.error(f"Agent error: {e}")
-            import traceback
+            logger.error("Agent error: %s", e)
             traceback.print_exc()
             return False
         finally:
@@ -510,6 +926,15 @@ AgenticBrowser = OllamaAgent
 
 # CLI ENTRY
 
+def run_event_loop(coro):
+    """`asyncio.run`, on uvloop's faster event loop when it's installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
 async def main():
     """CLI entry point."""
     import sys
@@ -531,7 +956,10 @@ async def main():
         debug_mode=True
     )
     
-    success = await agent.run(goal=goal, start_url=start_url)
+    try:
+        success = await agent.run(goal=goal, start_url=start_url)
+    finally:
+        await BrowserPool.shutdown()
     
     print(f"\n{'='*60}")
     print(f"Result: {'✅ SUCCESS' if success else '❌ INCOMPLETE'}")
@@ -539,4 +967,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_event_loop(main())
@@ -1,16 +1,46 @@
 
-import hashlib
 import logging
 from typing import Dict, List, Tuple, Optional
-from playwright.async_api import Page, Locator
+from playwright.async_api import BrowserContext, Page, Locator
 from playwright._impl._errors import TimeoutError as PlaywrightTimeoutError
 
 logger = logging.getLogger(__name__)
 
 
+# Page-change fingerprint computed in the page (cyrb53 over URL + first
+# 3000 chars of text), so only 14 hex chars cross the CDP bridge
+PAGE_HASH_SCRIPT = """
+() => {
+    const str = location.href + ':' + (document.body ? document.body.innerText.slice(0, 3000) : '');
+    let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+    for (let i = 0; i < str.length; i++) {
+        const ch = str.charCodeAt(i);
+        h1 = Math.imul(h1 ^ ch, 2654435761);
+        h2 = Math.imul(h2 ^ ch, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(16).padStart(14, '0');
+}
+"""
+
+
 # SoM tagging with overlap detection
 TAGGING_SCRIPT = """
-(function() {
+([drawOverlays, reuseKey]) => {
+    const hashPage = (__PAGE_HASH__);
+    // What the tagging result depends on: content, scroll, viewport, DOM
+    // size, and rendered text length (the hash only sees the first 3000
+    // chars, so CSS-revealed text further down must still change the key)
+    const tagKey = (hash) => hash + ':' + window.scrollX + ',' + window.scrollY + ':' +
+        window.innerWidth + 'x' + window.innerHeight + ':' + document.getElementsByTagName('*').length +
+        ':' + (document.body ? document.body.innerText.length : 0);
+    
+    // Nothing changed since the last tagging and its IDs are still on the page
+    if (reuseKey && document.querySelector('[data-agent-id]') && tagKey(hashPage()) === reuseKey) {
+        return {reused: true, key: reuseKey};
+    }
+    
     // Remove any existing tags
     const existingTags = document.querySelectorAll('[data-agent-tag="true"]');
     existingTags.forEach(tag => tag.remove());
@@ -18,6 +48,9 @@ TAGGING_SCRIPT = """
     const existingMarked = document.querySelectorAll('[data-agent-id]');
     existingMarked.forEach(elem => elem.removeAttribute('data-agent-id'));
     
+    // Page fingerprint for change detection, taken before any badges are drawn
+    const pageHash = hashPage();
+    
     // Find all interactive elements
     const selectors = [
         'a[href]',
@@ -36,8 +69,12 @@ TAGGING_SCRIPT = """
     const allElements = document.querySelectorAll(selectors.join(','));
     
     // Helper: Check if element is covered by another element (overlap detection)
-    function isElementCovered(elem) {
-        const rect = elem.getBoundingClientRect();
+    function isElementCovered(elem, rect) {
+        if (layerRects && !layerRects.some(l =>
+            rect.left < l.right && rect.right > l.left &&
+            rect.top < l.bottom && rect.bottom > l.top
+        )) return false;
+        
         const centerX = rect.left + rect.width / 2;
         const centerY = rect.top + rect.height / 2;
         
@@ -50,9 +87,41 @@ TAGGING_SCRIPT = """
         return !elem.contains(topElement) && !topElement.contains(elem) && topElement !== elem;
     }
     
-    // Filter visible, non-covered elements and assign IDs
+    // Rects of everything that can paint over other content: positioned
+    // layers (fixed, sticky, or absolute/relative with a z-index) among the
+    // ancestors of the candidates and of whatever is on top at a grid of
+    // viewport points. Rows are 20px apart for thin bars; columns are
+    // dense near both edges for corner widgets.
+    const vw = window.innerWidth, vh = window.innerHeight;
+    const gridXs = [12, 36, 60, vw * 0.1, vw * 0.3, vw * 0.5, vw * 0.7, vw * 0.9, vw - 60, vw - 36, vw - 12];
+    const gridYs = [];
+    for (let y = 10; y < vh; y += 20) gridYs.push(y);
+    
+    function findLayerRects(candidates) {
+        const layers = new Set();
+        const seen = new Set();
+        const walk = (el) => {
+            // Stop at nodes an earlier walk already went through
+            while (el && !seen.has(el) && el !== document.body && el !== document.documentElement) {
+                seen.add(el);
+                const st = window.getComputedStyle(el);
+                if (st.position === 'fixed' || st.position === 'sticky' ||
+                    ((st.position === 'absolute' || st.position === 'relative') && st.zIndex !== 'auto')) {
+                    layers.add(el);
+                }
+                el = el.parentElement;
+            }
+        };
+        candidates.forEach(item => walk(item.element.parentElement));
+        gridYs.forEach(y => gridXs.forEach(x => walk(document.elementFromPoint(x, y))));
+        return Array.from(layers, layer => layer.getBoundingClientRect())
+            .filter(r => r.width > 0 && r.height > 0);
+    }
+    
+    // Filter visible, non-covered elements. Layout reads only here;
+    // IDs are written afterwards so reads and writes don't interleave
     const elements = [];
-    let idCounter = 1;
+    const visible = [];
     
     allElements.forEach(elem => {
         const style = window.getComputedStyle(elem);
@@ -71,27 +140,45 @@ TAGGING_SCRIPT = """
             rect.right > 0
         );
         
-        if (!isVisible) return;
-        
+        if (isVisible) visible.push({element: elem, rect: rect});
+    });
+    
+    // With more candidates than grid points, hit-test only the ones under
+    // a covering layer; otherwise hit-testing every candidate is cheaper
+    const layerRects = visible.length > gridXs.length * gridYs.length ? findLayerRects(visible) : null;
+    
+    visible.forEach(({element: elem, rect}) => {
         // OVERLAP DETECTION: Skip if covered by popup/modal
-        if (isElementCovered(elem)) {
+        if (isElementCovered(elem, rect)) {
             console.log('Skipping covered element:', elem);
             return;
         }
         
-        elem.setAttribute('data-agent-id', idCounter);
         elements.push({
-            id: idCounter,
-            element: elem
+            id: elements.length + 1,
+            element: elem,
+            rect: rect
         });
-        idCounter++;
     });
     
-    // Create visual overlays
+    elements.forEach(item => item.element.setAttribute('data-agent-id', item.id));
+    
+    // Digest the tagged elements in the same pass, so observation
+    // needs no second DOM walk
+    const elementInfo = (__ELEMENT_INFO__);
+    const infos = elements.map(item => elementInfo(item.element));
+    
+    // Badges are only useful to a human watching the page
+    if (!drawOverlays) {
+        return {count: elements.length, pageHash: pageHash, infos: infos, key: tagKey(pageHash)};
+    }
+    
+    // Create visual overlays (positions from the rects already read),
+    // attached in one insertion
+    const fragment = document.createDocumentFragment();
     elements.forEach(item => {
-        const elem = item.element;
         const id = item.id;
-        const rect = elem.getBoundingClientRect();
+        const rect = item.rect;
         
         const overlay = document.createElement('div');
         overlay.setAttribute('data-agent-tag', 'true');
@@ -117,14 +204,53 @@ TAGGING_SCRIPT = """
         `;
         overlay.textContent = id.toString();
         
-        document.body.appendChild(overlay);
+        fragment.appendChild(overlay);
     });
+    document.body.appendChild(fragment);
     
-    return elements.length;
-})();
+    // Keyed with the badges in place, as the next call will find the page
+    return {count: elements.length, pageHash: pageHash, infos: infos, key: tagKey(hashPage())};
+}
 """
 
 
+# Alternate action names the LLM may emit -> canonical action
+ACTION_ALIASES: Dict[str, str] = {
+    'scroll': 'scroll_down',
+}
+
+
+# Compact per-element digest for the LLM (one line per element)
+ELEMENT_INFO_SCRIPT = """
+(el) => {
+    const tag = el.tagName.toLowerCase();
+    const label = el.innerText || el.value || el.placeholder || el.getAttribute('aria-label') || '';
+    return {
+        elem_id: parseInt(el.getAttribute('data-agent-id'), 10) || 0,
+        tag: tag,
+        // Fall back to ARIA role so clickable divs/spans don't show up as plain tags
+        type: el.getAttribute('type') || el.getAttribute('role') || tag,
+        // Collapse whitespace so multi-line labels stay on one line
+        text: label.replace(/\\s+/g, ' ').trim().slice(0, 50),
+        href: el.getAttribute('href') || '',
+        name: el.getAttribute('name') || '',
+        id: el.id || ''
+    };
+}
+"""
+
+# Digest of every tagged element in one evaluate (document order = ID order)
+ELEMENT_INFOS_SCRIPT = """
+() => Array.from(document.querySelectorAll('[data-agent-id]'), el => (__ELEMENT_INFO__)(el))
+""".replace("__ELEMENT_INFO__", ELEMENT_INFO_SCRIPT.strip())
+
+TAGGING_SCRIPT = (
+    TAGGING_SCRIPT
+    .replace("__PAGE_HASH__", PAGE_HASH_SCRIPT.strip())
+    .replace("__ELEMENT_INFO__", ELEMENT_INFO_SCRIPT.strip())
+)
+
+
 # JavaScript for highlighting element before action
 HIGHLIGHT_SCRIPT = """
 (selector) => {
@@ -174,6 +300,82 @@ HIGHLIGHT_SCRIPT = """
 """
 
 
+# Scroll, then resolve once the new layout has been painted. Hidden or
+# minimized windows never run rAF, so give up waiting after 100ms.
+SCROLL_SCRIPT = """
+(dy) => new Promise(resolve => {
+    window.scrollBy(0, dy);
+    requestAnimationFrame(() => requestAnimationFrame(resolve));
+    setTimeout(resolve, 100);
+})
+"""
+
+# Resolve once the DOM has gone `quietMs` without a mutation (or after `capMs`)
+DOM_SETTLE_SCRIPT = """
+([quietMs, capMs]) => new Promise(resolve => {
+    let timer = null;
+    const done = () => { observer.disconnect(); clearTimeout(timer); clearTimeout(cap); resolve(); };
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(done, quietMs);
+    });
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    timer = setTimeout(done, quietMs);
+    const cap = setTimeout(done, capMs);
+})
+"""
+
+# Count in-flight fetch/XHR requests in `window.__agentActiveReq`, so waits
+# can track the page's own traffic (Playwright's networkidle only covers
+# the initial document load)
+NETWORK_HOOK_SCRIPT = """
+(() => {
+    window.__agentActiveReq = 0;
+    const done = () => { window.__agentActiveReq = Math.max(0, window.__agentActiveReq - 1); };
+    const origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function () {
+            window.__agentActiveReq++;
+            try {
+                return origFetch.apply(this, arguments).finally(done);
+            } catch (e) {
+                done();
+                throw e;
+            }
+        };
+    }
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        // Count only sends that started (a throwing send never fires loadend);
+        // synchronous requests have already finished when send returns
+        const result = origSend.apply(this, arguments);
+        if (this.readyState !== XMLHttpRequest.DONE) {
+            window.__agentActiveReq++;
+            this.addEventListener('loadend', done, {once: true});
+        }
+        return result;
+    };
+})();
+"""
+
+# Registered once per context (see `install`) so every page gets the
+# helpers pre-compiled, instead of re-parsing them on each evaluate
+INIT_SCRIPT = f"""
+window.__agentTag = {TAGGING_SCRIPT.strip()};
+window.__agentElementInfo = {ELEMENT_INFO_SCRIPT.strip()};
+window.__agentPageHash = {PAGE_HASH_SCRIPT.strip()};
+window.__agentSettle = {DOM_SETTLE_SCRIPT.strip()};
+window.__agentHighlight = {HIGHLIGHT_SCRIPT.strip()};
+{NETWORK_HOOK_SCRIPT.strip()}
+"""
+TAG_CALL = "(args) => window.__agentTag(args)"
+ELEMENT_INFOS_CALL = "() => Array.from(document.querySelectorAll('[data-agent-id]'), el => window.__agentElementInfo(el))"
+PAGE_HASH_CALL = "() => window.__agentPageHash()"
+DOM_SETTLE_CALL = "(args) => window.__agentSettle(args)"
+NETWORK_QUIET_CALL = "() => window.__agentActiveReq <= 0"
+HIGHLIGHT_CALL = "(selector) => window.__agentHighlight(selector)"
+
+
 class BrowserIntelliSense:
     """
     Production-grade Set-of-Mark (SoM) implementation.
@@ -181,43 +383,136 @@ class BrowserIntelliSense:
     Features:
     - Overlap detection (skips covered elements)
     - Debug highlighting (red box before actions)
-    - Smart waits (networkidle)
+    - Smart waits (fetch/XHR quiet, then DOM quiet)
     - Robust error handling
     """
     
-    def __init__(self, debug_mode: bool = False):
+    def __init__(
+        self,
+        debug_mode: bool = False,
+        draw_overlays: bool = True,
+        max_wait_ms: int = 3000
+    ):
         self.element_map: Dict[int, Locator] = {}
         self.element_info: List[Dict] = []
         self.debug_mode = debug_mode
+        self.draw_overlays = draw_overlays
+        # Upper bound for _smart_wait; split between network and DOM quiet
+        self.max_wait_ms = max_wait_ms
+        # Key of the last tagging pass, plus its hash and digests, so an
+        # unchanged page is not re-tagged; cleared by page-changing actions
         self._last_content_hash: Optional[str] = None
-        logger.info(f"BrowserIntelliSense initialized (debug={debug_mode})")
+        self._tagged_page_hash = ""
+        self._tagged_info: List[Dict] = []
+        # Page hash taken by the last inject_script (same evaluate as tagging)
+        self.last_page_hash = ""
+        # Element digests returned by the last inject_script, consumed
+        # by the next get_observation
+        self._pending_info: Optional[List[Dict]] = None
+        
+        # Full script sources until `install` registers them on the context
+        self._tag_script = TAGGING_SCRIPT
+        self._element_infos_script = ELEMENT_INFOS_SCRIPT
+        self._page_hash_script = PAGE_HASH_SCRIPT
+        self._settle_script = DOM_SETTLE_SCRIPT
+        self._highlight_script = HIGHLIGHT_SCRIPT
+        # Request counter check; None until `install` adds the hook
+        self._network_quiet_script: Optional[str] = None
+        
+        # SoM selectors are stable per ID, so Locators can be reused
+        # across observations of the same page
+        self._locator_page: Optional[Page] = None
+        self._locator_cache: Dict[int, Locator] = {}
+        
+        # Action dispatch tables: (page, action_dict) and
+        # (page, locator, elem_id, action_dict) handlers respectively
+        self._page_actions = {
+            'navigate': lambda page, a: self._safe_navigate(page, a.get('url') or a.get('value', '')),
+            'scroll_down': lambda page, a: self._safe_scroll(page, 500),
+            'scroll_up': lambda page, a: self._safe_scroll(page, -500),
+            'wait': self._wait,
+            'done': self._done,
+        }
+        self._element_actions = {
+            'click': lambda page, loc, eid, a: self._safe_click(page, loc, eid),
+            'type': lambda page, loc, eid, a: self._safe_type(page, loc, eid, a.get('text') or a.get('value', '')),
+            'press_enter': lambda page, loc, eid, a: self._safe_press_enter(page, loc, eid),
+        }
+        
+        logger.info("BrowserIntelliSense initialized (debug=%s, overlays=%s)", debug_mode, draw_overlays)
+    
+    async def install(self, context: BrowserContext) -> None:
+        """
+        Register the page helpers on a browser context.
+        
+        Must run before the context's pages are created; afterwards
+        tagging, element-info, hash, settle and highlight calls only
+        ship a one-line stub.
+        """
+        await context.add_init_script(INIT_SCRIPT)
+        self._tag_script = TAG_CALL
+        self._element_infos_script = ELEMENT_INFOS_CALL
+        self._page_hash_script = PAGE_HASH_CALL
+        self._settle_script = DOM_SETTLE_CALL
+        self._highlight_script = HIGHLIGHT_CALL
+        self._network_quiet_script = NETWORK_QUIET_CALL
     
     async def inject_script(self, page: Page) -> Tuple[int, str]:
         """
         Inject SoM tagging script with overlap detection.
         
+        Also records the pre-tagging page hash in `last_page_hash` and
+        the tagged elements' digests for `get_observation`, saving
+        separate round-trips for both.
+        
+        If the page is unchanged since the last pass (same content,
+        scroll, viewport and DOM size, and no page-changing action in
+        between), the previous tags are kept instead of re-tagging.
+        
         Returns:
             Tuple of (num_elements, error_message)
         """
         logger.info("Injecting Set-of-Mark script...")
+        self.last_page_hash = ""
+        self._pending_info = None
         
         try:
             # Wait for page to be stable
             await page.wait_for_load_state('domcontentloaded')
             
-            num_elements = await page.evaluate(TAGGING_SCRIPT)
-            logger.info(f"Tagged {num_elements} interactive elements (overlap-filtered)")
+            result = await page.evaluate(
+                self._tag_script, [self.draw_overlays, self._last_content_hash]
+            )
+            self._last_content_hash = result['key']
+            if result.get('reused'):
+                logger.info("Page unchanged, reusing previous tags")
+            else:
+                self._tagged_page_hash = result['pageHash']
+                self._tagged_info = result['infos']
+            self.last_page_hash = self._tagged_page_hash
+            self._pending_info = self._tagged_info
+            num_elements = len(self._tagged_info)
+            logger.info("Tagged %d interactive elements (overlap-filtered)", num_elements)
             return num_elements, ""
             
         except PlaywrightTimeoutError:
+            self._last_content_hash = None
             return 0, "TIMEOUT: Script injection timed out"
         except Exception as e:
+            self._last_content_hash = None
             return 0, f"SCRIPT_ERROR: {str(e)[:100]}"
     
-    async def get_observation(self, page: Page) -> Tuple[Dict[int, Locator], str, str]:
+    async def get_observation(
+        self, page: Page, max_chars: Optional[int] = None
+    ) -> Tuple[Dict[int, Locator], str, str]:
         """
         Get observation data from tagged elements.
         
+        Args:
+            page: Playwright Page
+            max_chars: Stop once the element text reaches this size;
+                later elements are left out
+            
         Returns:
             Tuple of (element_map, element_text, error)
         """
@@ -227,52 +522,56 @@ class BrowserIntelliSense:
         self.element_info = []
         
         try:
-            tagged_elements = await page.query_selector_all('[data-agent-id]')
+            # Reuse the digests from tagging; otherwise one round-trip for all
+            infos = self._pending_info
+            self._pending_info = None
+            if infos is None:
+                infos = await page.evaluate(self._element_infos_script)
             element_lines = []
+            text_len = 0
             
-            for elem in tagged_elements:
-                try:
-                    elem_id = await elem.get_attribute('data-agent-id')
-                    if not elem_id:
-                        continue
-                    
-                    elem_id = int(elem_id)
-                    
-                    # Get element info
-                    info = await page.evaluate("""(el) => {
-                        return {
-                            tag: el.tagName.toLowerCase(),
-                            type: el.getAttribute('type') || el.tagName.toLowerCase(),
-                            text: (el.innerText || el.value || el.placeholder || el.getAttribute('aria-label') || '').trim().slice(0, 50),
-                            href: el.getAttribute('href') || '',
-                            name: el.getAttribute('name') || '',
-                            id: el.id || ''
-                        };
-                    }""", elem)
-                    
-                    # Store locator
-                    self.element_map[elem_id] = page.locator(f'[data-agent-id="{elem_id}"]')
-                    
-                    # Store info
-                    info['elem_id'] = elem_id
-                    self.element_info.append(info)
-                    
-                    # Create text line
-                    text_part = f': "{info["text"]}"' if info['text'] else ''
-                    element_lines.append(f"[{elem_id}] {info['type']}{text_part}")
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to extract element: {e}")
+            for info in infos:
+                elem_id = info['elem_id']
+                if not elem_id:
                     continue
+                
+                # Create text line
+                text_part = f': "{info["text"]}"' if info['text'] else ''
+                line = f"[{elem_id}] {info['type']}{text_part}"
+                
+                # Whole lines only; the model can't use a cut-off one
+                text_len += len(line) + 1
+                if max_chars is not None and text_len > max_chars + 1:
+                    break
+                
+                # Store locator
+                self.element_map[elem_id] = self._locator_for(page, elem_id)
+                
+                # Store info
+                self.element_info.append(info)
+                
+                element_lines.append(line)
             
             element_text = "\n".join(element_lines)
-            logger.info(f"Extracted {len(self.element_map)} elements")
+            logger.info("Extracted %d elements", len(self.element_map))
             
             return self.element_map, element_text, ""
             
         except Exception as e:
             return {}, "", f"OBSERVATION_ERROR: {str(e)[:100]}"
     
+    def _locator_for(self, page: Page, elem_id: int) -> Locator:
+        """Get the (cached) Locator for a SoM element ID."""
+        if page is not self._locator_page:
+            self._locator_page = page
+            self._locator_cache = {}
+        
+        locator = self._locator_cache.get(elem_id)
+        if locator is None:
+            locator = page.locator(f'[data-agent-id="{elem_id}"]')
+            self._locator_cache[elem_id] = locator
+        return locator
+    
     async def highlight_element(self, page: Page, elem_id: int) -> bool:
         """
         Draw red box around element before clicking (debug mode).
@@ -286,14 +585,14 @@ class BrowserIntelliSense:
         """
         try:
             selector = f'[data-agent-id="{elem_id}"]'
-            result = await page.evaluate(HIGHLIGHT_SCRIPT, selector)
+            result = await page.evaluate(self._highlight_script, selector)
             if result:
-                logger.info(f"🔴 Highlighted element #{elem_id}")
+                logger.info("🔴 Highlighted element #%s", elem_id)
                 # Brief pause to show highlight
                 await page.wait_for_timeout(300)
             return result
         except Exception as e:
-            logger.warning(f"Highlight failed: {e}")
+            logger.warning("Highlight failed: %s", e)
             return False
     
     async def execute_action(
@@ -315,25 +614,14 @@ class BrowserIntelliSense:
         Returns:
             Tuple of (success, result_message)
         """
-        action_type = action_dict.get('action', '').lower()
+        action_type = (action_dict.get('action') or '').lower()
+        action_type = ACTION_ALIASES.get(action_type, action_type)
         target_id = action_dict.get('target_id') or action_dict.get('id')
         
         # Handle non-element actions
-        if action_type == 'navigate':
-            url = action_dict.get('url') or action_dict.get('value', '')
-            return await self._safe_navigate(page, url)
-        
-        if action_type in ['scroll', 'scroll_down']:
-            return await self._safe_scroll(page, 500)
-        
-        if action_type == 'scroll_up':
-            return await self._safe_scroll(page, -500)
-        
-        if action_type == 'wait':
-            return await self._smart_wait(page)
-        
-        if action_type == 'done':
-            return True, "GOAL_COMPLETE"
+        page_handler = self._page_actions.get(action_type)
+        if page_handler:
+            return await page_handler(page, action_dict)
         
         # For element actions, need target_id
         if target_id is None:
@@ -356,22 +644,29 @@ class BrowserIntelliSense:
             await self.highlight_element(page, target_id)
         
         # Execute
-        if action_type == 'click':
-            return await self._safe_click(page, locator, target_id)
-        elif action_type == 'type':
-            text = action_dict.get('text') or action_dict.get('value', '')
-            return await self._safe_type(page, locator, target_id, text)
-        elif action_type == 'press_enter':
-            return await self._safe_press_enter(page, locator, target_id)
-        else:
+        element_handler = self._element_actions.get(action_type)
+        if element_handler is None:
             return False, f"ERROR: Unknown action '{action_type}'"
+        
+        return await element_handler(page, locator, target_id, action_dict)
+    
+    async def _done(self, page: Page, action_dict: Dict) -> Tuple[bool, str]:
+        """Goal reached; nothing to execute."""
+        return True, "GOAL_COMPLETE"
+    
+    async def _wait(self, page: Page, action_dict: Dict) -> Tuple[bool, str]:
+        """Let the page settle; it may change meanwhile, so re-tag afterwards."""
+        self._last_content_hash = None
+        return await self._smart_wait(page)
     
     async def _safe_click(
         self, page: Page, locator: Locator, elem_id: int
     ) -> Tuple[bool, str]:
         """Click with comprehensive error handling."""
         try:
-            logger.info(f"Clicking element #{elem_id}")
+            # Page is about to change; re-tag on the next observation
+            self._last_content_hash = None
+            logger.info("Clicking element #%s", elem_id)
             await locator.click(timeout=5000)
             
             # Smart wait for page response
@@ -397,7 +692,8 @@ class BrowserIntelliSense:
     ) -> Tuple[bool, str]:
         """Type with error handling."""
         try:
-            logger.info(f"Typing into #{elem_id}")
+            self._last_content_hash = None
+            logger.info("Typing into #%s", elem_id)
             await locator.fill(text, timeout=5000)
             return True, f"Typed '{text[:20]}...' into #{elem_id}"
         except PlaywrightTimeoutError:
@@ -410,7 +706,8 @@ class BrowserIntelliSense:
     ) -> Tuple[bool, str]:
         """Press enter with error handling."""
         try:
-            logger.info(f"Pressing Enter on #{elem_id}")
+            self._last_content_hash = None
+            logger.info("Pressing Enter on #%s", elem_id)
             await locator.press('Enter', timeout=5000)
             await self._smart_wait(page)
             return True, f"Pressed Enter on #{elem_id}"
@@ -420,7 +717,8 @@ class BrowserIntelliSense:
     async def _safe_navigate(self, page: Page, url: str) -> Tuple[bool, str]:
         """Navigate with smart wait."""
         try:
-            logger.info(f"Navigating to {url}")
+            self._last_content_hash = None
+            logger.info("Navigating to %s", url)
             await page.goto(url, wait_until="domcontentloaded", timeout=15000)
             await self._smart_wait(page)
             return True, f"Navigated to {url}"
@@ -433,35 +731,51 @@ class BrowserIntelliSense:
         """Scroll with error handling."""
         try:
             direction = "down" if amount > 0 else "up"
-            await page.evaluate(f"window.scrollBy(0, {amount})")
-            await page.wait_for_timeout(300)
+            # Fixed source + argument, so the script isn't recompiled per amount.
+            # Resolves after two frames (scrolled layout painted), or 100ms at most.
+            await page.evaluate(SCROLL_SCRIPT, amount)
             return True, f"Scrolled {direction}"
         except Exception as e:
             return False, f"SCROLL_ERROR: {str(e)[:60]}"
     
     async def _smart_wait(self, page: Page) -> Tuple[bool, str]:
         """
-        Smart wait using networkidle instead of static timeout.
-        Falls back to shorter timeout if networkidle takes too long.
+        Smart wait using network quiet instead of static timeout.
+        
+        With the helpers installed, waits for the page's own fetch/XHR
+        count to reach zero and the DOM to go quiet for 200ms; otherwise
+        uses Playwright's networkidle. Busy pages (analytics, polling)
+        never go quiet, so after half of `max_wait_ms` fall back to
+        waiting for the DOM to stop changing. Both waits are event-driven
+        and return as soon as the page is quiet, so fast pages pay only
+        the 200ms quiet window; slow ones are capped at `max_wait_ms`.
         """
+        phase_ms = self.max_wait_ms // 2
         try:
-            # Try networkidle with 3s timeout
-            await page.wait_for_load_state('networkidle', timeout=3000)
+            if self._network_quiet_script:
+                await page.wait_for_function(self._network_quiet_script, timeout=phase_ms)
+                await page.evaluate(self._settle_script, [200, phase_ms])
+            else:
+                await page.wait_for_load_state('networkidle', timeout=phase_ms)
             return True, "Page stable"
         except PlaywrightTimeoutError:
-            # Fall back to short fixed wait
-            await page.wait_for_timeout(500)
-            return True, "Waited (timeout fallback)"
+            try:
+                await page.evaluate(self._settle_script, [200, phase_ms])
+            except Exception:
+                pass
+            return True, "DOM settled (network busy)"
         except Exception:
-            await page.wait_for_timeout(500)
+            # Usually a navigation in flight; wait for the new document instead of sleeping
+            try:
+                await page.wait_for_load_state('domcontentloaded', timeout=self.max_wait_ms)
+            except Exception:
+                pass
             return True, "Waited"
     
     async def get_page_hash(self, page: Page) -> str:
         """Get hash of page content for change detection."""
         try:
-            content = await page.evaluate("() => document.body.innerText.slice(0, 3000)")
-            url = page.url
-            return hashlib.md5(f"{url}:{content}".encode()).hexdigest()[:16]
+            return await page.evaluate(self._page_hash_script)
         except Exception:
             return ""
     
@@ -473,7 +787,11 @@ class BrowserIntelliSense:
         return None
     
     async def cleanup(self, page: Page) -> None:
-        """Remove all visual overlays."""
+        """Remove all visual overlays and SoM IDs."""
+        # IDs are gone from the page, so their Locators are stale
+        self._locator_page = None
+        self._locator_cache = {}
+        self._last_content_hash = None
         try:
             await page.evaluate("""
                 () => {
@@ -1,5 +1,5 @@
 import asyncio
-from agent import OllamaAgent
+from agent import OllamaAgent, BrowserPool
 from security import SecurityEngine
 
 async def run_demo():
@@ -84,6 +84,7 @@ async def run_demo():
     finally:
         print("\n[6] Closing browser...")
         await agent.stop()
+        await BrowserPool.shutdown()
         print("    Done")
 
 if __name__ == "__main__":
@@ -11,11 +11,16 @@ class DOMDistiller:
     by extracting only interactive and text elements.
     """
     
+    # Output caps (applied in-page so discarded elements never cross the bridge)
+    MAX_INTERACTIVE = 100
+    MAX_CONTENT = 50
+    
     # JavaScript code to extract distilled DOM
     EXTRACTION_SCRIPT = """
-    () => {
+    (limits) => {
         const elements = [];
         let idCounter = 0;
+        let contentCount = 0;
         
         // Interactive element selectors
         const interactiveSelectors = [
@@ -33,6 +38,7 @@ class DOMDistiller:
         // Get all interactive elements
         interactiveSelectors.forEach(selector => {
             document.querySelectorAll(selector).forEach(el => {
+                if (idCounter >= limits.interactive) return;
                 if (!el.offsetParent && el.tagName !== 'INPUT') return; // Skip hidden
                 
                 const text = (el.innerText || el.value || el.placeholder || el.title || '').trim();
@@ -54,6 +60,7 @@ class DOMDistiller:
         const seenTexts = new Set();
         textSelectors.forEach(selector => {
             document.querySelectorAll(selector).forEach(el => {
+                if (contentCount >= limits.content) return;
                 if (!el.offsetParent) return; // Skip hidden
                 
                 const text = el.innerText.trim();
@@ -61,6 +68,7 @@ class DOMDistiller:
                 if (text.length > 200) return; // Skip very long paragraphs
                 
                 seenTexts.add(text);
+                contentCount++;
                 
                 const role = el.tagName.toLowerCase();
                 
@@ -95,7 +103,10 @@ class DOMDistiller:
             logger.info("Distilling page DOM...")
             
             # Execute extraction script
-            elements = await page.evaluate(self.EXTRACTION_SCRIPT)
+            elements = await page.evaluate(
+                self.EXTRACTION_SCRIPT,
+                {"interactive": self.MAX_INTERACTIVE, "content": self.MAX_CONTENT}
+            )
             
             if not elements:
                 return "Error: No elements extracted"
@@ -104,12 +115,12 @@ class DOMDistiller:
             output = self._format_elements(elements)
             
             tokens_estimate = len(output) // 4
-            logger.info(f"Distilled {len(elements)} elements (~{tokens_estimate} tokens)")
+            logger.info("Distilled %d elements (~%d tokens)", len(elements), tokens_estimate)
             
             return output
             
         except Exception as e:
-            logger.error(f"Error distilling page: {e}")
+            logger.error("Error distilling page: %s", e)
             return f"Error: {str(e)}"
     
     def _format_elements(self, elements: List[Dict]) -> str:
@@ -132,7 +143,7 @@ class DOMDistiller:
         # Interactive elements first (these have IDs)
         if interactive:
             lines.append("--- Interactive Elements ---")
-            for elem in interactive[:100]:  # Limit to 100
+            for elem in interactive[:self.MAX_INTERACTIVE]:
                 elem_type = elem['type'].capitalize()
                 text = elem['text'] or '(no text)'
                 elem_id = elem['id']
@@ -146,7 +157,7 @@ class DOMDistiller:
         # Content elements (no IDs needed)
         if content:
             lines.append("--- Page Content ---")
-            for elem in content[:50]:  # Limit to 50
+            for elem in content[:self.MAX_CONTENT]:
                 elem_type = elem['type'].upper()
                 text = elem['text']
                 
@@ -176,8 +187,9 @@ async def demo_distiller(page):
     print("=" * 70 + "\n")
     
     # Estimate token reduction
-    original_text = await page.evaluate("() => document.body.innerText")
-    original_tokens = len(original_text) // 4
+    # Only the length is needed; don't ship the whole body text over CDP
+    original_length = await page.evaluate("() => document.body.innerText.length")
+    original_tokens = original_length // 4
     distilled_tokens = len(simplified) // 4
     
     print(f"Original: ~{original_tokens:,} tokens")
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 
-import asyncio
 import argparse
 import logging
 import sys
+import traceback
 from typing import Optional
 
-from agent import OllamaAgent
+from agent import OllamaAgent, BrowserPool, run_event_loop
 
 # Configure logging
 logging.basicConfig(
@@ -93,10 +93,11 @@ async def run_agent(
         await agent.stop()
         return False
     except Exception as e:
-        logger.error(f"Agent error: {e}")
-        import traceback
+        logger.error("Agent error: %s", e)
         traceback.print_exc()
         return False
+    finally:
+        await BrowserPool.shutdown()
 
 
 def main():
@@ -160,7 +161,7 @@ Examples:
     args = parser.parse_args()
     
     # Run the agent
-    success = asyncio.run(run_agent(
+    success = run_event_loop(run_agent(
         goal=args.goal,
         start_url=args.url,
         model=args.model,
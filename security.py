@@ -44,6 +44,9 @@ class SecurityEngine:
         ".sh", ".py", ".rb", ".pl"
     ]
     
+    # Actions that never touch page content or leave the page
+    SAFE_ACTIONS = frozenset({"scroll", "scroll_down", "scroll_up", "wait", "done"})
+    
     def __init__(self, whitelist: Optional[List[str]] = None, enabled: bool = True):
         """
         Initialize the security engine.
@@ -56,20 +59,20 @@ class SecurityEngine:
         self.enabled = enabled
         self.risk_threshold = 50  # Actions above this require user approval
         
-        logger.info(f"SecurityEngine initialized (enabled={enabled})")
-        logger.info(f"Whitelist: {', '.join(self.whitelist)}")
+        logger.info("SecurityEngine initialized (enabled=%s)", enabled)
+        logger.info("Whitelist: %s", ', '.join(self.whitelist))
     
     def add_trusted_domain(self, domain: str) -> None:
         """Add a domain to the whitelist."""
         if domain not in self.whitelist:
             self.whitelist.append(domain)
-            logger.info(f"Added {domain} to whitelist")
+            logger.info("Added %s to whitelist", domain)
     
     def remove_trusted_domain(self, domain: str) -> None:
         """Remove a domain from the whitelist."""
         if domain in self.whitelist:
             self.whitelist.remove(domain)
-            logger.info(f"Removed {domain} from whitelist")
+            logger.info("Removed %s from whitelist", domain)
     
     def is_whitelisted(self, url: str) -> bool:
         """
@@ -97,7 +100,7 @@ class SecurityEngine:
             return False
             
         except Exception as e:
-            logger.error(f"Error parsing URL {url}: {e}")
+            logger.error("Error parsing URL %s: %s", url, e)
             return False
     
     def sanitize_and_wrap(self, raw_html: str) -> Dict[str, str]:
@@ -168,11 +171,11 @@ class SecurityEngine:
         # Calculate similarity
         similarity = SequenceMatcher(None, visual_text, dom_text).ratio()
         
-        logger.debug(f"Visual-DOM similarity: {similarity:.2%}")
+        logger.debug("Visual-DOM similarity: %.2f%%", similarity * 100)
         
         if similarity < threshold:
             reason = f"Visual-Code Mismatch (similarity: {similarity:.2%} < {threshold:.0%})"
-            logger.warning(f"Deceptive UI detected: {reason}")
+            logger.warning("Deceptive UI detected: %s", reason)
             return False, reason
         
         return True, f"Visual-DOM match verified ({similarity:.2%})"
@@ -205,6 +208,9 @@ class SecurityEngine:
             return 0, "Security disabled"
         
         action_type = action.get('action', '').lower()
+        if action_type in self.SAFE_ACTIONS:
+            return 0, "Safe action"
+        
         value = action.get('value', '')
         
         risk = 0
@@ -275,11 +281,6 @@ class SecurityEngine:
                         risk += 10
                         reasons.append("Submit button (whitelisted site)")
         
-        # SCROLL / WAIT (Low Risk)
-        elif action_type in ['scroll', 'wait']:
-            risk += 0
-            reasons.append("Safe action")
-        
         # UNKNOWN ACTION
         else:
             risk += 30
@@ -290,7 +291,7 @@ class SecurityEngine:
         
         reason_str = "; ".join(reasons) if reasons else "No specific risk factors"
         
-        logger.info(f"Risk assessment: {risk}/100 - {reason_str}")
+        logger.info("Risk assessment: %d/100 - %s", risk, reason_str)
         
         return risk, reason_str
     
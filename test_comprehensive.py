@@ -6,7 +6,7 @@ Updated for OllamaAgent (Production-Grade)
 
 import asyncio
 import json
-from agent import OllamaAgent, AgenticBrowser
+from agent import OllamaAgent, AgenticBrowser, BrowserPool
 from browser_sense import BrowserIntelliSense
 from security import SecurityEngine
 
@@ -25,6 +25,10 @@ def test_json_extraction(agent):
     cases = [
         ('{"action": "click", "target_id": 5}', True),
         ('```json {"action": "type", "value": "hi"} ```', True),
+        ('Here { is {"action":"click","target_id":1}', True),
+        ('```json\n{"action": "scroll_down"}', True),
+        ('Sure: {"action": "type", "value": "x}{y"} done', True),
+        ('{' * 20000, False),
         ('bad json', False)
     ]
     for text, expect in cases:
@@ -47,8 +51,28 @@ async def run_async_tests():
         obs, _, _ = await agent.som.get_observation(agent._page)
         print(f"   ✅ Observed: {len(obs)} elements")
         
+        # Long link list under a thin sticky bar and a small corner widget:
+        # links either one covers must not be tagged
+        links = ''.join(f'<a href="#{i}">{i}</a>' for i in range(1500))
+        await agent._page.set_content(
+            '<style>body{margin:0} a{display:inline-block;width:36px;height:20px;margin:2px}'
+            '.bar{position:sticky;top:0;height:24px;background:#333;z-index:10}'
+            '.chat{position:fixed;right:30px;bottom:30px;width:40px;height:40px;background:#09f}</style>'
+            f'<div class="bar"></div>{links}<div class="chat"></div>'
+        )
+        await agent._page.evaluate("window.scrollTo(0, 200)")
+        await agent.som.inject_script(agent._page)
+        mistagged = await agent._page.evaluate("""() => Array.from(document.querySelectorAll('a'), a => {
+            const r = a.getBoundingClientRect();
+            if (r.top < 0 || r.bottom > innerHeight) return 0;
+            const top = document.elementFromPoint(r.left + r.width / 2, r.top + r.height / 2);
+            return (top === a) !== a.hasAttribute('data-agent-id') ? 1 : 0;
+        }).reduce((n, x) => n + x, 0)""")
+        print(f"   {'✅' if mistagged == 0 else '❌'} Covered links skipped ({mistagged} mistagged)")
+        
     finally:
         await agent.stop()
+        await BrowserPool.shutdown()
         print("   ✅ Stopped")
 
 if __name__ == "__main__":